@@ -1,28 +1,74 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-import finnhub
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
+import httpx
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from operator import itemgetter
+from functools import lru_cache
+from cachetools import LRUCache, TTLCache
+import logging
 import os
+import secrets
 
 # AI/ML Imports
-try:
-    from neuralprophet import NeuralProphet
-except ImportError:
-    NeuralProphet = None
+# Prophet and NeuralProphet (torch, lightning, plotly) take seconds and hundreds
+# of MB to import, so they are loaded on first use rather than at startup
+@lru_cache(maxsize=None)
+def _load_neural_prophet():
+    try:
+        from neuralprophet import NeuralProphet
+    except ImportError:
+        return None
+    return NeuralProphet
+
+@lru_cache(maxsize=None)
+def _load_prophet():
+    try:
+        from prophet import Prophet
+    except ImportError:
+        return None
+    return Prophet
 
 try:
-    from prophet import Prophet
+    from numba import njit
 except ImportError:
-    Prophet = None
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+logger = logging.getLogger(__name__)
 
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import MinMaxScaler
+def _warmup_kernels():
+    """Compile jitted kernels up front so the first request doesn't pay for it"""
+    _ses(np.zeros(2), 0.3)
 
-app = FastAPI()
+async def _start_predict_executor():
+    """Spawn every pool worker now (they start lazily) so their imports and
+    kernel warmup happen at startup rather than on the first /predict"""
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(
+        loop.run_in_executor(predict_executor, _warmup_kernels)
+        for _ in range(PREDICT_WORKERS)
+    ))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jitted kernels only run inside the pool, so that is where they are warmed
+    await _start_predict_executor()
+    yield
+    await finnhub_client.aclose()
+    predict_executor.shutdown(cancel_futures=True)
+
+# 2.x: historical and predictions are sent column-wise as dicts of arrays
+app = FastAPI(version="2.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -33,9 +79,74 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Finnhub client
+# Finnhub client (async, so upstream calls don't block the event loop).
+# One pooled client per worker process keeps TLS connections alive between
+# requests; HTTP/2 multiplexes concurrent upstream calls over them.
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY", "d5of0v9r01qjast6bkp0d5of0v9r01qjast6bkpg")
-finnhub_client = finnhub.Client(api_key=FINNHUB_API_KEY)
+FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
+finnhub_client = httpx.AsyncClient(
+    base_url=FINNHUB_BASE_URL,
+    headers={"X-Finnhub-Token": FINNHUB_API_KEY},
+    timeout=10.0,
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    ),
+)
+
+async def finnhub_get(path: str, params: Dict) -> Dict:
+    """Call a Finnhub REST endpoint and return the decoded JSON body"""
+    response = await finnhub_client.get(path, params=params)
+    response.raise_for_status()
+    return response.json()
+
+# Response caches: quotes go stale quickly, daily candles only change once a day
+QUOTE_CACHE_TTL = 30
+CANDLE_CACHE_TTL = 24 * 60 * 60
+quote_cache = TTLCache(maxsize=1024, ttl=QUOTE_CACHE_TTL)
+candle_cache = TTLCache(maxsize=256, ttl=CANDLE_CACHE_TTL)
+
+# Uvicorn worker processes. Requests are async, so a couple of workers cover
+# I/O; CPU-bound fits are parallelised by the per-worker process pool instead,
+# which is sized from this so the two don't multiply past the core count.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 2))
+
+# Admin endpoints require this value in the X-Admin-Token header; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Upper bound on /predict-batch size; each item holds a full history in memory
+MAX_BATCH_SIZE = 32
+
+MODELS = ('neural_prophet', 'prophet', 'lstm', 'arima', 'linear_regression')
+
+# Short horizons on these models are served by a direct extrapolation
+FAST_PATH_MODELS = ('lstm', 'arima', 'linear_regression')
+FAST_PATH_MAX_DAYS = 3
+
+# Fitted Prophet/NeuralProphet models, reused while the training data is unchanged
+model_cache = LRUCache(maxsize=64)
+
+# Model fits are CPU-bound, so /predict runs them in worker processes rather
+# than on the event loop. Workers are spawned (not forked) from the threaded
+# server. The cores are split across uvicorn workers so the total number of
+# fit processes stays near the core count. Each pool worker keeps its own
+# model_cache, and jobs go to whichever worker is free, so a repeat fit only
+# hits the cache when it lands on the worker that trained the model.
+PREDICT_WORKERS = max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+
+def _new_predict_executor() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=PREDICT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warmup_kernels,
+    )
+
+predict_executor = _new_predict_executor()
+
+# Pool-bound /predict calls currently running, so identical concurrent
+# requests share one fit instead of each starting their own
+_inflight: Dict[tuple, asyncio.Future] = {}
 
 class PredictionRequest(BaseModel):
     symbol: str
@@ -47,53 +158,94 @@ class PredictionRequest(BaseModel):
 def read_root():
     return {"status": "Stock Prediction API Running"}
 
+def _require_admin(token: Optional[str]):
+    """Reject admin calls unless ADMIN_TOKEN is configured and matches"""
+    if not ADMIN_TOKEN or not token or not secrets.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+@app.post("/admin/cache/clear")
+async def clear_cache(x_admin_token: Optional[str] = Header(None)):
+    """Drop all cached Finnhub responses
+    
+    Caches live in each uvicorn worker, so this only clears the worker that
+    handles the request. Run with WEB_CONCURRENCY=1 (or restart) to flush all.
+    """
+    _require_admin(x_admin_token)
+    quote_cache.clear()
+    candle_cache.clear()
+    return {"status": "Cache cleared"}
+
 @app.get("/current-price/{symbol}")
 async def get_current_price(symbol: str):
     """Get real-time stock price"""
     try:
-        quote = finnhub_client.quote(symbol)
-        return {
+        cached = quote_cache.get(symbol)
+        if cached is not None:
+            logger.debug("Quote cache hit: %s", symbol)
+            return cached
+        logger.debug("Quote cache miss: %s", symbol)
+        
+        quote = await finnhub_get("/quote", {"symbol": symbol})
+        result = {
             "symbol": symbol,
             "price": quote['c'],  # current price
             "change": quote['d'],  # change
             "percent_change": quote['dp'],  # percent change
             "timestamp": datetime.now().isoformat()
         }
+        quote_cache[symbol] = result
+        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/historical/{symbol}")
 async def get_historical_data(symbol: str):
-    """Get historical stock data (1 year)"""
+    """Get historical stock data (1 year)
+    
+    Candles are returned column-wise ({"date": [...], "open": [...], ...}) as
+    ORJSONResponse directly to skip FastAPI's per-element jsonable_encoder pass.
+    """
     try:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=365)
         
+        # Key on calendar days so intraday requests share one entry
+        cache_key = (symbol, start_date.date(), end_date.date())
+        cached = candle_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Candle cache hit: %s", symbol)
+            return ORJSONResponse(cached)
+        logger.debug("Candle cache miss: %s", symbol)
+        
         # Convert to Unix timestamp
         start_ts = int(start_date.timestamp())
         end_ts = int(end_date.timestamp())
         
         # Fetch candle data
-        res = finnhub_client.stock_candles(
-            symbol, 'D', start_ts, end_ts
-        )
+        res = await finnhub_get("/stock/candle", {
+            "symbol": symbol,
+            "resolution": 'D',
+            "from": start_ts,
+            "to": end_ts
+        })
         
         if res['s'] != 'ok':
             raise HTTPException(status_code=404, detail="No data found")
         
-        # Convert to list of dicts
-        historical = []
-        for i in range(len(res['t'])):
-            historical.append({
-                'date': datetime.fromtimestamp(res['t'][i]).strftime('%Y-%m-%d'),
-                'open': res['o'][i],
-                'high': res['h'][i],
-                'low': res['l'][i],
-                'close': res['c'][i],
-                'volume': res['v'][i]
-            })
+        # Finnhub already sends columns; only the timestamps need converting
+        timestamps = np.asarray(res['t'], dtype='datetime64[s]')
+        historical = {
+            'date': np.datetime_as_string(timestamps, unit='D').tolist(),
+            'open': res['o'],
+            'high': res['h'],
+            'low': res['l'],
+            'close': res['c'],
+            'volume': res['v']
+        }
         
-        return {"symbol": symbol, "historical": historical}
+        result = {"symbol": symbol, "historical": historical}
+        candle_cache[cache_key] = result
+        return ORJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -104,196 +256,314 @@ def prepare_dataframe(historical: List[Dict]) -> pd.DataFrame:
     df = df.sort_values('date')
     return df
 
-def predict_neural_prophet(df: pd.DataFrame, days: int) -> List[Dict]:
+def prepare_arrays(historical: List[Dict]) -> Tuple[np.ndarray, Optional[pd.Timestamp]]:
+    """Extract date-ordered closes and the last date (None if there is no history)"""
+    records = sorted(historical, key=itemgetter('date'))
+    closes = np.fromiter((r['close'] for r in records), dtype=np.float64, count=len(records))
+    last_date = pd.Timestamp(records[-1]['date']) if records else None
+    return closes, last_date
+
+def _to_columns(last_date: pd.Timestamp, preds) -> Dict:
+    """Pair predicted closes with the calendar days following last_date"""
+    preds = np.asarray(preds, dtype=np.float64)
+    base = last_date.to_datetime64().astype('datetime64[D]')
+    dates = base + np.arange(1, len(preds) + 1, dtype='timedelta64[D]')
+    return {'date': np.datetime_as_string(dates, unit='D').tolist(), 'close': preds}
+
+def _model_cache_key(model_name: str, df: pd.DataFrame, *extra) -> tuple:
+    """Identify a fitted model by the series it was trained on"""
+    closes = df['close'].to_numpy(dtype=np.float64)
+    return (model_name, len(df), int(df['date'].max().value), hash(closes.tobytes()), *extra)
+
+def _forecast_columns(forecast: pd.DataFrame, last_date: pd.Timestamp, column: str, days: int) -> Dict:
+    """Take the first `days` forecast rows after last_date as date/close columns"""
+    future = forecast.loc[forecast['ds'] > last_date].head(days)
+    return {
+        'date': future['ds'].dt.strftime('%Y-%m-%d').tolist(),
+        'close': future[column].to_numpy(dtype=np.float64)
+    }
+
+def _fallback_prediction(df: pd.DataFrame, days: int) -> Dict:
+    """Linear regression on a prepared DataFrame, used when Prophet models fail"""
+    return predict_linear_regression(df['close'].to_numpy(dtype=np.float64), df['date'].max(), days)
+
+def predict_neural_prophet(df: pd.DataFrame, days: int) -> Dict:
     """Neural Prophet prediction"""
+    NeuralProphet = _load_neural_prophet()
     if NeuralProphet is None:
-        return predict_linear_regression(df, days)
+        return _fallback_prediction(df, days)
     
     try:
         # Prepare data for NeuralProphet
         prophet_df = df[['date', 'close']].copy()
         prophet_df.columns = ['ds', 'y']
         
-        # Train model
-        model = NeuralProphet(
-            n_forecasts=days,
-            yearly_seasonality=True,
-            weekly_seasonality=True,
-            daily_seasonality=False,
-            epochs=50,
-            learning_rate=0.01
-        )
-        
-        model.fit(prophet_df, freq='D')
+        # Train model (n_forecasts is baked into the network, so it is part of the key)
+        cache_key = _model_cache_key('neural_prophet', df, days)
+        model = model_cache.get(cache_key)
+        if model is None:
+            # Low Fourier orders and a bounded changepoint count keep the design
+            # matrix small. Epochs stay capped explicitly: NeuralProphet's automatic
+            # choice is ~180 for a year of daily data, and early stopping (patience
+            # 20 on train loss) rarely ends training sooner
+            model = NeuralProphet(
+                n_forecasts=days,
+                n_changepoints=10,
+                yearly_seasonality=6,
+                weekly_seasonality=3,
+                daily_seasonality=False,
+                epochs=50,
+                learning_rate=0.01
+            )
+            
+            model.fit(prophet_df, freq='D', early_stopping=True)
+            model_cache[cache_key] = model
         
         # Make predictions
         future = model.make_future_dataframe(prophet_df, periods=days)
         forecast = model.predict(future)
         
         # Extract predictions
-        predictions = []
-        last_historical_date = df['date'].max()
-        
-        for idx, row in forecast.iterrows():
-            pred_date = row['ds']
-            if pred_date > last_historical_date:
-                predictions.append({
-                    'date': pred_date.strftime('%Y-%m-%d'),
-                    'close': float(row['yhat1'])
-                })
-        
-        return predictions[:days]
+        return _forecast_columns(forecast, df['date'].max(), 'yhat1', days)
     except Exception as e:
         print(f"Neural Prophet error: {e}")
-        return predict_linear_regression(df, days)
+        return _fallback_prediction(df, days)
 
-def predict_prophet(df: pd.DataFrame, days: int) -> List[Dict]:
+def predict_prophet(df: pd.DataFrame, days: int) -> Dict:
     """Facebook Prophet prediction"""
+    Prophet = _load_prophet()
     if Prophet is None:
-        return predict_linear_regression(df, days)
+        return _fallback_prediction(df, days)
     
     try:
         prophet_df = df[['date', 'close']].copy()
         prophet_df.columns = ['ds', 'y']
         
-        model = Prophet(daily_seasonality=False)
-        model.fit(prophet_df)
+        cache_key = _model_cache_key('prophet', df)
+        model = model_cache.get(cache_key)
+        if model is None:
+            model = Prophet(daily_seasonality=False)
+            model.fit(prophet_df)
+            model_cache[cache_key] = model
         
         future = model.make_future_dataframe(periods=days)
         forecast = model.predict(future)
         
-        predictions = []
-        last_date = df['date'].max()
-        
-        for idx, row in forecast.iterrows():
-            if row['ds'] > last_date:
-                predictions.append({
-                    'date': row['ds'].strftime('%Y-%m-%d'),
-                    'close': float(row['yhat'])
-                })
-        
-        return predictions[:days]
+        return _forecast_columns(forecast, df['date'].max(), 'yhat', days)
     except Exception as e:
         print(f"Prophet error: {e}")
-        return predict_linear_regression(df, days)
+        return _fallback_prediction(df, days)
 
-def predict_linear_regression(df: pd.DataFrame, days: int) -> List[Dict]:
+def predict_linear_regression(closes: np.ndarray, last_date: pd.Timestamp, days: int) -> Dict:
     """Linear Regression prediction"""
     # Use last 60 days for training
-    df_train = df.tail(60).copy()
-    df_train['days'] = range(len(df_train))
+    y = closes[-60:]
+    n = y.size
+    x = np.arange(n, dtype=np.float64)
     
-    X = df_train[['days']].values
-    y = df_train['close'].values
-    
-    model = LinearRegression()
-    model.fit(X, y)
+    # Closed-form least squares fit of close ~ day index
+    x_mean = x.mean()
+    y_mean = y.mean()
+    slope = ((x - x_mean) * (y - y_mean)).sum() / ((x - x_mean) ** 2).sum()
+    intercept = y_mean - slope * x_mean
     
     # Predict future
-    last_day = len(df_train)
-    future_days = np.array([[last_day + i] for i in range(1, days + 1)])
-    predictions_values = model.predict(future_days)
-    
-    # Generate dates
-    last_date = df['date'].max()
-    predictions = []
+    future_days = np.arange(n + 1, n + 1 + days, dtype=np.float64)
+    predictions_values = intercept + slope * future_days
     
-    for i, pred in enumerate(predictions_values):
-        pred_date = last_date + timedelta(days=i+1)
-        predictions.append({
-            'date': pred_date.strftime('%Y-%m-%d'),
-            'close': float(pred)
-        })
-    
-    return predictions
+    return _to_columns(last_date, predictions_values)
+
+@njit(cache=True, fastmath=True)
+def _ses(prices: np.ndarray, alpha: float) -> np.ndarray:
+    """Simple exponential smoothing over a float64 price array"""
+    n = prices.shape[0]
+    out = np.empty(n)
+    out[0] = prices[0]
+    one_minus_alpha = 1.0 - alpha
+    for i in range(1, n):
+        out[i] = alpha * prices[i] + one_minus_alpha * out[i - 1]
+    return out
 
-def predict_lstm(df: pd.DataFrame, days: int) -> List[Dict]:
+def predict_lstm(closes: np.ndarray, last_date: pd.Timestamp, days: int) -> Dict:
     """LSTM prediction (simplified version)"""
     # Use exponential smoothing as a proxy
-    prices = df['close'].values
     alpha = 0.3
     
-    smoothed = [prices[0]]
-    for i in range(1, len(prices)):
-        smoothed.append(alpha * prices[i] + (1 - alpha) * smoothed[-1])
+    smoothed = _ses(closes, alpha)
     
     # Predict future
-    predictions = []
-    last_date = df['date'].max()
     last_value = smoothed[-1]
     
     # Simple trend continuation
     trend = (smoothed[-1] - smoothed[-20]) / 20
     
-    for i in range(days):
-        pred_date = last_date + timedelta(days=i+1)
-        pred_value = last_value + trend * (i + 1)
-        predictions.append({
-            'date': pred_date.strftime('%Y-%m-%d'),
-            'close': float(pred_value)
-        })
+    predictions_values = last_value + trend * np.arange(1, days + 1)
     
-    return predictions
+    return _to_columns(last_date, predictions_values)
 
-def predict_arima(df: pd.DataFrame, days: int) -> List[Dict]:
+def predict_arima(closes: np.ndarray, last_date: pd.Timestamp, days: int) -> Dict:
     """ARIMA-like prediction using moving average"""
     window = 20
-    prices = df['close'].values
     
-    # Calculate moving average
-    ma = pd.Series(prices).rolling(window=window).mean()
-    last_ma = ma.iloc[-1]
+    # Moving average over the most recent window only
+    last_ma = closes[-window:].mean()
     
     # Simple trend
-    trend = (prices[-1] - prices[-window]) / window
+    trend = (closes[-1] - closes[-window]) / window
     
-    predictions = []
-    last_date = df['date'].max()
+    predictions_values = last_ma + trend * np.arange(1, days + 1)
     
-    for i in range(days):
-        pred_date = last_date + timedelta(days=i+1)
-        pred_value = last_ma + trend * (i + 1)
-        predictions.append({
-            'date': pred_date.strftime('%Y-%m-%d'),
-            'close': float(pred_value)
-        })
+    return _to_columns(last_date, predictions_values)
+
+def _cheap_extrapolate(closes: np.ndarray, last_date: pd.Timestamp, days: int) -> Dict:
+    """Extend the average slope of the last 3 closes"""
+    slope = (closes[-1] - closes[-3]) / 2
+    return _to_columns(last_date, closes[-1] + slope * np.arange(1, days + 1))
+
+def _predict_one(request: PredictionRequest) -> Dict:
+    """Run the selected model for a single prediction request"""
+    # ValueError rather than HTTPException: this runs in worker processes and
+    # HTTPException can't be pickled back to the server
+    if request.model not in MODELS:
+        raise ValueError("Invalid model")
+    
+    if request.days <= 0:
+        return {
+            "symbol": request.symbol,
+            "model": request.model,
+            "predictions": {'date': [], 'close': []}
+        }
+    
+    # Only the Prophet models need a DataFrame; the rest work on raw closes
+    if request.model in ('neural_prophet', 'prophet'):
+        df = prepare_dataframe(request.historical)
+        n_points = len(df)
+    else:
+        closes, last_date = prepare_arrays(request.historical)
+        n_points = len(closes)
+    
+    if n_points < 30:
+        raise ValueError("Insufficient historical data")
+    
+    # Route to appropriate model
+    if request.model in FAST_PATH_MODELS and request.days <= FAST_PATH_MAX_DAYS:
+        predictions = _cheap_extrapolate(closes, last_date, request.days)
+    elif request.model == 'neural_prophet':
+        predictions = predict_neural_prophet(df, request.days)
+    elif request.model == 'prophet':
+        predictions = predict_prophet(df, request.days)
+    elif request.model == 'lstm':
+        predictions = predict_lstm(closes, last_date, request.days)
+    elif request.model == 'arima':
+        predictions = predict_arima(closes, last_date, request.days)
+    else:
+        predictions = predict_linear_regression(closes, last_date, request.days)
     
-    return predictions
+    return {
+        "symbol": request.symbol,
+        "model": request.model,
+        "predictions": predictions
+    }
+
+def _request_key(request: PredictionRequest) -> tuple:
+    """Identify a prediction request by its inputs"""
+    series = tuple((h.get('date'), h.get('close')) for h in request.historical)
+    return (request.symbol, request.model, request.days, hash(series))
+
+def _replace_broken_executor(executor: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """Swap in a fresh pool for a broken one, unless another request already did"""
+    global predict_executor
+    if predict_executor is executor:
+        # A killed worker (OOM, segfault) leaves the pool unusable for good
+        logger.warning("Prediction pool broken; starting a new one")
+        predict_executor = _new_predict_executor()
+        executor.shutdown(wait=False, cancel_futures=True)
+    return predict_executor
+
+async def _run_in_pool(request: PredictionRequest) -> Dict:
+    """Run _predict_one in the process pool, recovering from a broken pool"""
+    loop = asyncio.get_running_loop()
+    executor = predict_executor
+    try:
+        future = loop.run_in_executor(executor, _predict_one, request)
+    except BrokenProcessPool:
+        # The pool broke before this request reached it, so resubmitting is safe
+        executor = _replace_broken_executor(executor)
+        future = loop.run_in_executor(executor, _predict_one, request)
+    try:
+        return await future
+    except BrokenProcessPool:
+        # This request was queued or running when a worker died and may be what
+        # killed it; rebuild the pool for later requests but don't resubmit it
+        _replace_broken_executor(executor)
+        raise
+
+async def _predict_shared(request: PredictionRequest) -> Dict:
+    """Run _predict_one in the process pool, joining an identical in-flight run if any"""
+    key = _request_key(request)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_run_in_pool(request))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded so a client disconnecting doesn't cancel a fit others are awaiting
+    return await asyncio.shield(task)
+
+async def _run_prediction(request: PredictionRequest) -> Dict:
+    """Serve a prediction inline when it is cheap, otherwise from the shared pool"""
+    # Invalid, degenerate and short-horizon requests are cheaper than a process hop
+    if request.model not in MODELS or request.days <= 0 or (
+        request.model in FAST_PATH_MODELS and request.days <= FAST_PATH_MAX_DAYS
+    ):
+        return _predict_one(request)
+    return await _predict_shared(request)
 
 @app.post("/predict")
 async def predict_stock(request: PredictionRequest):
     """Generate stock predictions using selected model"""
     try:
-        df = prepare_dataframe(request.historical)
-        
-        if len(df) < 30:
-            raise HTTPException(
-                status_code=400, 
-                detail="Insufficient historical data"
-            )
-        
-        # Route to appropriate model
-        if request.model == 'neural_prophet':
-            predictions = predict_neural_prophet(df, request.days)
-        elif request.model == 'prophet':
-            predictions = predict_prophet(df, request.days)
-        elif request.model == 'lstm':
-            predictions = predict_lstm(df, request.days)
-        elif request.model == 'arima':
-            predictions = predict_arima(df, request.days)
-        elif request.model == 'linear_regression':
-            predictions = predict_linear_regression(df, request.days)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid model")
-        
-        return {
-            "symbol": request.symbol,
-            "model": request.model,
-            "predictions": predictions
-        }
+        result = await _run_prediction(request)
+        return ORJSONResponse(result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Prediction workers unavailable")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict-batch")
+async def predict_batch(requests: List[PredictionRequest]):
+    """Generate predictions for several symbols concurrently
+    
+    Entries run on the same process pool as /predict, so they share its
+    in-flight deduplication, and a failing entry reports its error inline
+    instead of failing the batch.
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size exceeds {MAX_BATCH_SIZE}"
+        )
+    
+    outcomes = await asyncio.gather(
+        *(_run_prediction(r) for r in requests), return_exceptions=True
+    )
+    results = [
+        {"symbol": r.symbol, "model": r.model, "error": str(outcome)}
+        if isinstance(outcome, BaseException) else outcome
+        for r, outcome in zip(requests, outcomes)
+    ]
+    return ORJSONResponse({"results": results})
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Caches are per worker process; "auto" picks uvloop/httptools when installed
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8000,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        workers=WEB_CONCURRENCY,
+        loop="auto",
+        http="auto",
+    )
\ No newline at end of file
@@ -0,0 +1,66 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+CANDLES = {
+    's': 'ok',
+    't': [1700006400, 1700092800, 1700179200],
+    'o': [10.0, 11.0, 12.0],
+    'h': [10.5, 11.5, 12.5],
+    'l': [9.5, 10.5, 11.5],
+    'c': [10.2, 11.2, 12.2],
+    'v': [100, 200, 300],
+}
+
+
+def finnhub_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith('/quote'):
+        return httpx.Response(200, json={'c': 12.2, 'd': 1.0, 'dp': 8.9})
+    if request.url.path.endswith('/stock/candle'):
+        return httpx.Response(200, json=CANDLES)
+    return httpx.Response(404)
+
+
+@pytest.fixture(autouse=True)
+def isolated_server(monkeypatch):
+    """Mock Finnhub and run pool work on threads so tests stay in-process"""
+    monkeypatch.setattr(server, 'finnhub_client', httpx.AsyncClient(
+        base_url=server.FINNHUB_BASE_URL,
+        transport=httpx.MockTransport(finnhub_handler),
+    ))
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(server, 'predict_executor', executor)
+    server.quote_cache.clear()
+    server.candle_cache.clear()
+    server._inflight.clear()
+    yield
+    executor.shutdown()
+
+
+@pytest.fixture
+def candles():
+    return CANDLES
+
+
+@pytest.fixture
+def make_historical():
+    """Build /predict history rows with daily dates starting 2024-01-01"""
+    def build(closes):
+        dates = pd.date_range('2024-01-01', periods=len(closes))
+        return [{'date': str(d.date()), 'close': float(c)} for d, c in zip(dates, closes)]
+    return build
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so lifespan (pool startup) is skipped
+    return TestClient(server.app)
@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def test_historical_is_columnar(client, candles):
+    response = client.get('/historical/AAPL')
+
+    assert response.status_code == 200
+    historical = response.json()['historical']
+    assert historical == {
+        'date': ['2023-11-15', '2023-11-16', '2023-11-17'],
+        'open': candles['o'],
+        'high': candles['h'],
+        'low': candles['l'],
+        'close': candles['c'],
+        'volume': candles['v'],
+    }
+
+
+def test_predict_returns_columnar_predictions(client, make_historical):
+    historical = make_historical(np.linspace(100, 150, 60))
+
+    response = client.post('/predict', json={
+        'symbol': 'AAPL', 'model': 'linear_regression', 'days': 5, 'historical': historical,
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['symbol'] == 'AAPL'
+    assert set(body['predictions']) == {'date', 'close'}
+    assert body['predictions']['date'] == [
+        '2024-03-01', '2024-03-02', '2024-03-03', '2024-03-04', '2024-03-05',
+    ]
+    assert len(body['predictions']['close']) == 5
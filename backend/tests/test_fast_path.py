@@ -0,0 +1,36 @@
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize('model', server.FAST_PATH_MODELS)
+def test_fast_path_extends_last_three_closes(client, make_historical, model):
+    closes = [100.0] * 57 + [100.0, 102.0, 106.0]
+
+    response = client.post('/predict', json={
+        'symbol': 'AAPL', 'model': model, 'days': 3, 'historical': make_historical(closes),
+    })
+
+    assert response.status_code == 200
+    # Average slope of the last 3 closes is (106 - 100) / 2 = 3
+    assert response.json()['predictions'] == {
+        'date': ['2024-03-01', '2024-03-02', '2024-03-03'],
+        'close': [109.0, 112.0, 115.0],
+    }
+
+
+def test_zero_days_returns_empty_predictions(client, make_historical):
+    response = client.post('/predict', json={
+        'symbol': 'AAPL', 'model': 'lstm', 'days': 0, 'historical': make_historical(range(60)),
+    })
+
+    assert response.status_code == 200
+    assert response.json()['predictions'] == {'date': [], 'close': []}
+
+
+def test_invalid_model_is_rejected_for_any_horizon(client, make_historical):
+    for days in (0, 2, 10):
+        response = client.post('/predict', json={
+            'symbol': 'AAPL', 'model': 'bogus', 'days': days, 'historical': make_historical(range(60)),
+        })
+        assert response.status_code == 400
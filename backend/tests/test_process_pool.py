@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import server
+
+
+def _kill_worker(request):
+    """Stand-in for a fit that takes its worker down (OOM, segfault)"""
+    os._exit(1)
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    """Use a real spawned pool and record every job submitted to any pool"""
+    submitted = []
+    submit = ProcessPoolExecutor.submit
+
+    def recording_submit(self, fn, *args, **kwargs):
+        submitted.append(fn)
+        return submit(self, fn, *args, **kwargs)
+
+    monkeypatch.setattr(ProcessPoolExecutor, 'submit', recording_submit)
+    pool = server._new_predict_executor()
+    monkeypatch.setattr(server, 'predict_executor', pool)
+    yield pool, submitted
+    pool.shutdown(cancel_futures=True)
+    server.predict_executor.shutdown(cancel_futures=True)
+
+
+def predict_payload(make_historical):
+    return {
+        'symbol': 'AAPL', 'model': 'arima', 'days': 10,
+        'historical': make_historical(np.linspace(100, 150, 60)),
+    }
+
+
+def test_request_that_kills_its_worker_is_not_resubmitted(
+    monkeypatch, client, make_historical, process_pool
+):
+    pool, submitted = process_pool
+    monkeypatch.setattr(server, '_predict_one', _kill_worker)
+
+    response = client.post('/predict', json=predict_payload(make_historical))
+
+    assert response.status_code == 503
+    assert submitted == [_kill_worker]
+    assert server.predict_executor is not pool
+
+
+def test_request_reaching_an_already_broken_pool_is_retried(
+    client, make_historical, process_pool
+):
+    pool, submitted = process_pool
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(_kill_worker, None).result()
+
+    response = client.post('/predict', json=predict_payload(make_historical))
+
+    assert response.status_code == 200
+    assert len(response.json()['predictions']['close']) == 10
+    assert server.predict_executor is not pool
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import numpy as np
+
+import server
+
+
+def test_duplicate_concurrent_requests_share_one_run(monkeypatch, make_historical):
+    calls = []
+    lock = threading.Lock()
+    predict_one = server._predict_one
+
+    def counting_predict_one(request):
+        with lock:
+            calls.append(request.symbol)
+        time.sleep(0.2)
+        return predict_one(request)
+
+    monkeypatch.setattr(server, '_predict_one', counting_predict_one)
+    payload = {
+        'symbol': 'AAPL', 'model': 'arima', 'days': 10,
+        'historical': make_historical(np.linspace(100, 150, 60)),
+    }
+
+    async def burst():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as http:
+            return await asyncio.gather(*(http.post('/predict', json=payload) for _ in range(5)))
+
+    responses = asyncio.run(burst())
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert len({r.content for r in responses}) == 1
+    assert calls == ['AAPL']
+    assert server._inflight == {}
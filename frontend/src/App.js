@@ -4,6 +4,12 @@ import { TrendingUp, RefreshCw, Database } from 'lucide-react';
 
 const API_BASE = 'http://localhost:8000';
 
+// The API sends series column-wise ({ date: [...], close: [...] }); pivot to rows for charting
+const toRows = (columns) =>
+  columns.date.map((_, i) =>
+    Object.fromEntries(Object.keys(columns).map(key => [key, columns[key][i]]))
+  );
+
 export default function StockPredictionApp() {
   const [symbol, setSymbol] = useState('AAPL');
   const [model, setModel] = useState('neural_prophet');
@@ -46,13 +52,14 @@ export default function StockPredictionApp() {
     try {
       const res = await fetch(`${API_BASE}/historical/${symbol}`);
       const data = await res.json();
+      const historical = toRows(data.historical);
       
       // Cache the data
-      historicalCacheRef.current[cacheKey] = data.historical;
+      historicalCacheRef.current[cacheKey] = historical;
       setCacheStatus('Cached');
       setLoading(false);
       
-      return data.historical;
+      return historical;
     } catch (err) {
       console.error('Historical fetch error:', err);
       setLoading(false);
@@ -82,7 +89,7 @@ export default function StockPredictionApp() {
       // Combine historical and predictions
       const combined = [
         ...historical.map(d => ({ ...d, type: 'historical' })),
-        ...data.predictions.map(d => ({ ...d, type: 'prediction' }))
+        ...toRows(data.predictions).map(d => ({ ...d, type: 'prediction' }))
       ];
       
       setChartData(combined);